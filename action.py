@@ -29,17 +29,22 @@ class PaintAction:
     steps: list[PaintStep] = field(default_factory=list)
     is_special: bool = False
 
-    def undo_apply(self, grid: Grid):
+    def __post_init__(self):
+        # picking the concrete apply pair once, so applying the action skips the is_special branch
         if self.is_special:
-            grid.special()
-            return
+            self.undo_apply = self.redo_apply = self._apply_special
+        else:
+            self.undo_apply = self._undo_steps
+            self.redo_apply = self._redo_steps
+
+    def _apply_special(self, grid: Grid):
+        grid.special()
+
+    def _undo_steps(self, grid: Grid):
         for step in self.steps:
             step.undo_apply(grid)
 
-    def redo_apply(self, grid: Grid):
-        if self.is_special:
-            grid.special()
-            return
+    def _redo_steps(self, grid: Grid):
         for step in self.steps:
             step.redo_apply(grid)
 
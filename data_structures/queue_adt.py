@@ -93,6 +93,16 @@ class CircularQueue(Queue[T]):
         """ True if the queue is full and no element can be appended. """
         return len(self) == len(self.array)
 
+    def reverse_inplace(self) -> None:
+        """ Reverses the order of the elements in the queue, in place.
+        :complexity: O(len(self)) swaps, no additional storage
+        """
+        capacity = len(self.array)
+        for k in range(self.length // 2):
+            i = (self.front + k) % capacity
+            j = (self.front + self.length - 1 - k) % capacity
+            self.array[i], self.array[j] = self.array[j], self.array[i]
+
     def clear(self) -> None:
         """ Clears all elements from the queue. """
         Queue.__init__(self)
@@ -178,6 +188,12 @@ class TestQueue(unittest.TestCase):
             for i in range(nitems):
                 self.assertEqual(queue.serve(), i)
 
+    def test_reverse_inplace(self):
+        for queue, length in zip(self.queues, self.lengths):
+            queue.reverse_inplace()
+            for i in range(length-1, -1, -1):
+                self.assertEqual(queue.serve(), i)
+
     def test_clear(self):
         for queue in self.queues:
             queue.clear()
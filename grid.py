@@ -31,7 +31,8 @@ class Grid:
         Should also intialise the brush size to the DEFAULT provided as a class variable.
 
         Raises:
-            - Value Error: x and y should be greater than or equal to 0
+            - Value Error: x and y should be greater than or equal to 0, and draw_style should be one of
+            DRAW_STYLE_OPTIONS
 
         Returns:
             - None
@@ -51,22 +52,26 @@ class Grid:
         self.y = y
         self.brush_size = Grid.DEFAULT_BRUSH_SIZE
 
+        # resolving the LayerStore class once, rather than branching on the draw style for every cell
+        if draw_style == Grid.DRAW_STYLE_SET:
+            store_class = layer_store.SetLayerStore
+        elif draw_style == Grid.DRAW_STYLE_ADD:
+            store_class = layer_store.AdditiveLayerStore
+        elif draw_style == Grid.DRAW_STYLE_SEQUENCE:
+            store_class = layer_store.SequenceLayerStore
+        else:
+            raise ValueError("draw_style should be one of DRAW_STYLE_OPTIONS")
+
         # initialised an array of length x and assigned to grid
         self.grid = referential_array.ArrayR(self.x)
 
-        # for length of x, creating arrays of length y to create grid, can be accessed using grid[x][y]
-        for i in range(self.x):
-            self.grid[i] = referential_array.ArrayR(self.y)
-
-        # looping through all of the grid and creating LayerStore() instances
+        # single pass over the grid: allocate each row and fill it with LayerStore() instances,
+        # can be accessed using grid[x][y]
         for i in range(self.x):
+            row = referential_array.ArrayR(self.y)
+            self.grid[i] = row
             for j in range(self.y):
-                if self.draw_style == Grid.DRAW_STYLE_OPTIONS[0]:
-                    self.grid[i][j] = layer_store.SetLayerStore()
-                elif self.draw_style == Grid.DRAW_STYLE_OPTIONS[1]:
-                    self.grid[i][j] = layer_store.AdditiveLayerStore()
-                elif self.draw_style == Grid.DRAW_STYLE_OPTIONS[2]:
-                    self.grid[i][j] = layer_store.SequenceLayerStore()
+                row[j] = store_class()
 
     def __getitem__(self, index: int) -> referential_array.ArrayR:
         """ Returns the object in position index.
@@ -121,10 +126,7 @@ class Grid:
             Best: O(1)
             Worst: O(1)
         """
-        if self.brush_size == Grid.MAX_BRUSH:
-            pass
-        else:
-            self.brush_size += 1
+        self.brush_size = min(self.brush_size + 1, Grid.MAX_BRUSH)
 
     def decrease_brush_size(self) -> None:
         """
@@ -144,10 +146,32 @@ class Grid:
             Best: O(1)
             Worst: O(1)
         """
-        if self.brush_size == Grid.MIN_BRUSH:
-            pass
-        else:
-            self.brush_size -= 1
+        self.brush_size = max(self.brush_size - 1, Grid.MIN_BRUSH)
+
+    def render(self, start: tuple[int, int, int], timestamp: float) -> list[list[tuple[int, int, int]]]:
+        """
+        Computes the colour of every grid square in a single sweep.
+        Args:
+            - start: tuple of ints, the RGB value of the starting colour shared by every square
+            - timestamp: used for animated layers
+
+        Raises:
+            - Nothing
+
+        Returns:
+            - list of x rows, each a list of y RGB tuples, indexed as [x][y]
+
+        Complexity:
+            Best: O(n*m*get_color), where n is the length of the x axis array, m is the length of the y axis
+            array and get_color is the complexity of the layer store's get_color
+            Worst: O(n*m*get_color), same as best
+        """
+        result = []
+        for i in range(self.x):
+            # binding the row once so the inner sweep does a single ArrayR lookup per cell
+            row = self.grid[i]
+            result.append([row[j].get_color(start, timestamp, i, j) for j in range(self.y)])
+        return result
 
     def special(self) -> None:
         """
@@ -167,5 +191,7 @@ class Grid:
             Worst: O(n*m*special), same as best
         """
         for i in range(self.x):
+            # binding the row once so the inner loop does a single ArrayR lookup per cell
+            row = self.grid[i]
             for j in range(self.y):
-                self.grid[i][j].special()
+                row[j].special()
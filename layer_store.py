@@ -2,17 +2,31 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 
-from data_structures.array_sorted_list import ArraySortedList
+from data_structures.bset import BSet
 from data_structures.queue_adt import CircularQueue
-from data_structures.sorted_list_adt import ListItem
-from data_structures.stack_adt import ArrayStack
 from layer_util import Layer
 from layer_util import get_layers
 from layers import *
 
+# the size of the layer registry and the registered layers in index order and in
+# lexicographic name order, precomputed once since the set of layers is fixed at import
+NUM_LAYER_SLOTS = len(get_layers())
+REGISTERED_LAYERS = tuple(layer for layer in get_layers() if layer is not None)
+LAYERS_BY_NAME = tuple(sorted(REGISTERED_LAYERS, key=lambda layer: layer.name))
+# (index, apply) dispatch table so per-pixel loops call the plain functions without
+# re-reading the apply attribute off each Layer dataclass
+REGISTERED_APPLIES = tuple((layer.index, layer.apply) for layer in REGISTERED_LAYERS)
+# the inversion applied by SetLayerStore's special mode, hoisted out of the per-pixel path
+INVERT_APPLY = invert.apply
+# bitmask of the opaque layers (output independent of the input colour); anything
+# applied before one of them is dead work
+OPAQUE_MASK = sum(1 << layer.index for layer in REGISTERED_LAYERS if layer.opaque)
+
 
 class LayerStore(ABC):
 
+    __slots__ = ()
+
     def __init__(self) -> None:
         pass
 
@@ -55,9 +69,11 @@ class SetLayerStore(LayerStore):
     - special: Invert the colour output.
     """
 
+    __slots__ = ("layer", "special_bool", "_cache_key", "_cache_color")
+
     def __init__(self) -> None:
         """
-        Initialises an ArrayStack and a boolean variable for the special function
+        Initialises the single layer slot and a boolean variable for the special function
         Args:
             - Nothing
 
@@ -68,12 +84,16 @@ class SetLayerStore(LayerStore):
             - None
 
         Complexity:
-            Best: O(1), initialising an ArrayStack is constant complexity
+            Best: O(1), two assignments
             Worst: O(1), same as best
         """
         super().__init__()
-        self.stack = ArrayStack(1)
+        self.layer = None
         self.special_bool = False
+        # single-entry get_color memo; a key of None means the store changed since
+        # the last computation
+        self._cache_key = None
+        self._cache_color = None
 
     def add(self, layer: Layer) -> bool:
         """
@@ -83,24 +103,21 @@ class SetLayerStore(LayerStore):
             - layer: a Layer object
 
         Raises:
-            - TypeError: if input is not of type Layer
+            - TypeError: if input is not of type Layer (check is skipped when running with -O)
 
         Returns:
             - bool: True if the LayerStore was changed, false if not
 
         Complexity:
-            Best: O(1), to add a layer even if the stack is empty, pushing is constant complexity
-            Worst: O(1), same as best, popping and pushing and checking is_full are all constant complexity
+            Best: O(1), a comparison and an assignment
+            Worst: O(1), same as best
         """
-        if not isinstance(layer, Layer):
+        if __debug__ and not isinstance(layer, Layer):
             raise TypeError("Input is not a Layer")
-        if self.stack.is_full():
-            self.stack.pop()
-            self.stack.push(layer)
-            return True
-        else:
-            self.stack.push(layer)
-            return True
+        changed = self.layer is not layer
+        self.layer = layer
+        self._cache_key = None
+        return changed
 
     def erase(self, layer: Layer) -> bool:
         """
@@ -110,24 +127,22 @@ class SetLayerStore(LayerStore):
             - layer: a Layer object
 
         Raises:
-            - TypeError: if input is not of type Layer
+            - TypeError: if input is not of type Layer (check is skipped when running with -O)
 
         Returns:
             - bool: True if the LayerStore was changed, false if not
 
         Complexity:
-            Best: O(1), constant complexity for is_empty
-            Worst: O(1), same as best, constant complexity for all operations
+            Best: O(1), a comparison and an assignment
+            Worst: O(1), same as best
         """
-        if not isinstance(layer, Layer):
+        if __debug__ and not isinstance(layer, Layer):
             raise TypeError("Input is not a Layer")
 
-        if self.stack.is_empty():
-            return self.stack.is_empty()
-        else:
-            self.stack.pop()
-
-        return self.stack.is_empty()
+        changed = self.layer is not None
+        self.layer = None
+        self._cache_key = None
+        return changed
 
     def special(self) -> None:
         """
@@ -146,10 +161,8 @@ class SetLayerStore(LayerStore):
             Worst: O(1), same as best, assignment is constant
         """
 
-        if not self.special_bool:
-            self.special_bool = True
-        elif self.special_bool:
-            self.special_bool = False
+        self.special_bool = not self.special_bool
+        self._cache_key = None
 
     def get_color(self, start: tuple[int, int, int], timestamp: int, x: int, y: int) -> tuple[int, int, int]:
         """
@@ -176,20 +189,23 @@ class SetLayerStore(LayerStore):
         if y < 0:
             raise ValueError("y must be greater than 0")
 
-        if not self.special_bool:
-            if self.stack.is_empty():
-                return start
-            else:
-                layer_peek = self.stack.peek()
-                colour = layer_peek.apply(start, timestamp, x, y)
-        elif self.special_bool:
-            if self.stack.is_empty():
-                colour = invert.apply(start, timestamp, x, y)
-            else:
-                layer_peek = self.stack.peek()
-                current_color = layer_peek.apply(start, timestamp, x, y)
-                colour = invert.apply(current_color, timestamp, x, y)
+        # the stored state and the inputs fully determine the result, so if nothing
+        # changed since the last call the memoised colour can be returned straight away
+        key = (start, timestamp, x, y)
+        if key == self._cache_key:
+            return self._cache_color
 
+        # base colour from the stored layer (or the start colour), then a single
+        # conditional inversion, rather than branching on all four state combinations
+        if self.layer is None:
+            colour = start
+        else:
+            colour = self.layer.apply(start, timestamp, x, y)
+        if self.special_bool:
+            colour = INVERT_APPLY(colour, timestamp, x, y)
+
+        self._cache_key = key
+        self._cache_color = colour
         return colour
 
 
@@ -201,9 +217,13 @@ class AdditiveLayerStore(LayerStore):
     - special: Reverse the order of current layers (first becomes last, etc.)
     """
 
+    MIN_CAPACITY = 4
+    __slots__ = ("max_size", "queue", "_cache_key", "_cache_color")
+
     def __init__(self) -> None:
         """
-        Initialises a CircularQueue of the maximum size of the number of layers multiplied by 100
+        Initialises a small CircularQueue that doubles on demand, capped at the number of
+        layers multiplied by 100
 
         Args:
             - Nothing
@@ -215,12 +235,30 @@ class AdditiveLayerStore(LayerStore):
             - None
 
         Complexity:
-            Best: O(self.max_size), dependent on ArrayR where the complexity is O(max_capacity)
-            Worst: O(self.max_size), same as best
+            Best: O(1), only MIN_CAPACITY slots are allocated up front
+            Worst: O(1), same as best
         """
         super().__init__()
-        self.max_size = len(get_layers())
-        self.queue = CircularQueue(self.max_size * 100)
+        self.max_size = NUM_LAYER_SLOTS * 100
+        self.queue = CircularQueue(self.MIN_CAPACITY)
+        # single-entry get_color memo; a key of None means the queue changed since
+        # the last computation
+        self._cache_key = None
+        self._cache_color = None
+
+    def _grow(self) -> None:
+        """
+        Doubles the capacity of the queue (without exceeding max_size) by draining it into
+        a larger CircularQueue.
+
+        Complexity:
+            Best: O(n), where n is the length of the queue
+            Worst: O(n), same as best
+        """
+        new_queue = CircularQueue(min(2 * len(self.queue.array), self.max_size))
+        for _ in range(self.queue.length):
+            new_queue.append(self.queue.serve())
+        self.queue = new_queue
 
     def add(self, layer: Layer) -> bool:
         """
@@ -230,24 +268,26 @@ class AdditiveLayerStore(LayerStore):
             - layer: a Layer object
 
         Raises:
-            - TypeError: if layer input is not of type Layer
+            - TypeError: if layer input is not of type Layer (check is skipped when running with -O)
 
         Returns:
             - bool: True if the LayerStore was changed, false if not
 
         Complexity:
             Best: O(1), all constant operations
-            Worst: O(1), same as best
+            Worst: O(n), where n is the length of the queue, when the queue has to grow
+            (amortised O(1))
         """
-        if not isinstance(layer, Layer):
+        if __debug__ and not isinstance(layer, Layer):
             raise TypeError("Input is not a Layer")
 
-        if not self.queue.is_full():
-            queue_length = self.queue.length
-            self.queue.append(layer)
-            return queue_length + 1 == self.queue.length
-        else:
+        if self.queue.length == self.max_size:
             return False
+        if self.queue.is_full():
+            self._grow()
+        self.queue.append(layer)
+        self._cache_key = None
+        return True
 
     def erase(self, layer: Layer) -> bool:
         """
@@ -257,7 +297,7 @@ class AdditiveLayerStore(LayerStore):
             - layer: a Layer object
 
         Raises:
-            - TypeError: if input is not of type Layer
+            - TypeError: if input is not of type Layer (check is skipped when running with -O)
 
         Returns:
             - bool: True if the LayerStore was changed, false if not
@@ -266,15 +306,14 @@ class AdditiveLayerStore(LayerStore):
             Best: O(1), all constant operations
             Worst: O(1), same as best
         """
-        if not isinstance(layer, Layer):
+        if __debug__ and not isinstance(layer, Layer):
             raise TypeError("Input is not a Layer")
 
-        if not self.queue.is_empty():
-            queue_length = self.queue.length
-            self.queue.serve()
-            return queue_length == self.queue.length + 1
-        else:
+        if self.queue.is_empty():
             return False
+        self.queue.serve()
+        self._cache_key = None
+        return True
 
     def special(self) -> None:
         """
@@ -289,26 +328,12 @@ class AdditiveLayerStore(LayerStore):
             - None
 
         Complexity:
-            Best: O(n) where n is the length of either the stack or the queue
+            Best: O(n) where n is the length of the queue
             Worst: O(n), same as best
         """
-        # creating stack to reverse
-        result_stack = ArrayStack(self.max_size * 100)
-        # creating queue for the result
-        result_queue = CircularQueue(self.max_size * 100)
-
-        for i in range(self.queue.length):
-            layer = self.queue.serve()
-            result_stack.push(layer)
-            # restoring layers to queue
-            self.queue.append(layer)
-
-        while not result_stack.is_empty():
-            result_layer = result_stack.pop()
-            if result_layer:
-                result_queue.append(result_layer)
-
-        self.queue = result_queue
+        # reversing the circular buffer in place, no temporary stack or queue needed
+        self.queue.reverse_inplace()
+        self._cache_key = None
 
     def get_color(self, start: tuple[int, int, int], timestamp: int, x: int, y: int) -> tuple[int, int, int]:
         """
@@ -333,13 +358,31 @@ class AdditiveLayerStore(LayerStore):
             raise ValueError("x must be greater than 0")
         if y < 0:
             raise ValueError("y must be greater than 0")
+        # the queue and the inputs fully determine the result, so if nothing changed
+        # since the last call the memoised colour can be returned straight away
+        key = (start, timestamp, x, y)
+        if key == self._cache_key:
+            return self._cache_color
+
         colour = start
-        count = 0
-        while count < self.queue.length:
-            layer = self.queue.serve()
+        # read-only traversal of the queue's backing array, so no serve/append
+        # rotation (and no queue writes) are needed just to look at each layer
+        queue = self.queue
+        array = queue.array
+        front = queue.front
+        capacity = len(array)
+        # layers before the last opaque one cannot affect the result, so skip them
+        skip = 0
+        for k in range(queue.length - 1, 0, -1):
+            if array[(front + k) % capacity].opaque:
+                skip = k
+                break
+        for k in range(skip, queue.length):
+            layer = array[(front + k) % capacity]
             colour = layer.apply(colour, timestamp, x, y)
-            self.queue.append(layer)
-            count += 1
+
+        self._cache_key = key
+        self._cache_color = colour
         return colour
 
 
@@ -353,9 +396,11 @@ class SequenceLayerStore(LayerStore):
         In the event of two layers being the median names, pick the lexicographically smaller one.
     """
 
+    __slots__ = ("applied",)
+
     def __init__(self) -> None:
         """
-        Initialises an ArraySortedList
+        Initialises a BSet holding the applied layer types as bits
         Args:
             - Nothing
 
@@ -366,12 +411,12 @@ class SequenceLayerStore(LayerStore):
             - None
 
         Complexity:
-            Best: O(1), initialising an Array Sorted List is constant
+            Best: O(1), initialising a BSet is constant
             Worst: O(1), same as best
         """
         super().__init__()
-        self.number_of_layers = 9
-        self.sorted_list = ArraySortedList(self.number_of_layers)
+        # bit layer.index + 1 is set iff that layer type is applied (BSet elements are positive ints)
+        self.applied = BSet()
 
     def add(self, layer: Layer) -> bool:
         """
@@ -381,21 +426,22 @@ class SequenceLayerStore(LayerStore):
             - layer: a Layer object
 
         Raises:
-            - TypeError: if layer input is not of type Layer
+            - TypeError: if layer input is not of type Layer (check is skipped when running with -O)
 
         Returns:
             - bool: True if the LayerStore was changed, false if not
 
         Complexity:
-            Best: O(log len(sorted_list)), or when the item is last
-            Worst: O(len(sorted_list)), or when the item is first
+            Best: O(1), a membership check and a bit set are both constant
+            Worst: O(1), same as best
         """
-        if not isinstance(layer, Layer):
+        if __debug__ and not isinstance(layer, Layer):
             raise TypeError("Input is not a Layer")
-        key = layer.index
-        list_item = ListItem(layer, key)
-        self.sorted_list.add(list_item)
-        return self.sorted_list.__contains__(list_item)
+        item = layer.index + 1
+        if item in self.applied:
+            return False
+        self.applied.add(item)
+        return True
 
     def erase(self, layer: Layer) -> bool:
         """
@@ -411,15 +457,14 @@ class SequenceLayerStore(LayerStore):
             - bool: True if the LayerStore was changed, false if not
 
         Complexity:
-            Best: O(1), item to be erased is the first element in the sorted list
-            Worst: O(n), where n is the length of the sorted list
+            Best: O(1), a membership check and a bit clear are both constant
+            Worst: O(1), same as best
         """
-        key = layer.index
-        erase_list_item = ListItem(layer, key)
-        for i in self.sorted_list:
-            if self.sorted_list.__contains__(erase_list_item):
-                self.sorted_list.remove(erase_list_item)
-        return self.sorted_list.__contains__(erase_list_item)
+        item = layer.index + 1
+        if item in self.applied:
+            self.applied.remove(item)
+            return True
+        return False
 
     def special(self) -> None:
         """
@@ -434,34 +479,19 @@ class SequenceLayerStore(LayerStore):
             - None
 
         Complexity:
-            Best: O(n), where n is the length of the sorted list
+            Best: O(n), where n is the number of registered layers
             Worst: O(n), same as best
         """
-        special_sorted_list = ArraySortedList(self.number_of_layers)
-        if not self.sorted_list.is_empty():
-            for i in range(self.sorted_list.length):
-                list_item = self.sorted_list[i]
-                value = list_item.value
-                key = value.name
-                list_item_special = ListItem(value, key)
-                special_sorted_list.add(list_item_special)
-
-            if special_sorted_list.length % 2 == 1:
-                index = special_sorted_list.length // 2
-                # get item at index, item_to_delete is a ListItem
-                item_to_delete = special_sorted_list[index]
-
-            else:
-                index = (special_sorted_list.length // 2) - 1
-                item_to_delete = special_sorted_list[index]
-
-            # new_value should be a Layer from the item_to_delete ListItem
-            new_value = item_to_delete.value
-            # new_key should be the unique index of the Layer
-            new_key = new_value.index
-            new_list_item = ListItem(new_value, new_key)
-            new_index = self.sorted_list.index(new_list_item)
-            self.sorted_list.delete_at_index(new_index)
+        if self.applied.is_empty():
+            return
+
+        # walking the precomputed name ordering gives the applied layers already sorted by name
+        elems = self.applied.elems
+        applied_by_name = [layer for layer in LAYERS_BY_NAME if (elems >> layer.index) & 1]
+
+        # the lower median when the count is even, i.e. the lexicographically smaller one
+        median_layer = applied_by_name[(len(applied_by_name) - 1) // 2]
+        self.applied.remove(median_layer.index + 1)
 
     def get_color(self, start: tuple[int, int, int], timestamp: int, x: int, y: int) -> tuple[int, int, int]:
         """
@@ -479,7 +509,7 @@ class SequenceLayerStore(LayerStore):
             - result: a tuple of ints, this will be the resulting colour after checking the applied layers
 
         Complexity:
-            Best: O(n*apply), where n is the length of the sorted list and apply is the apply function
+            Best: O(n*apply), where n is the number of registered layers and apply is the apply function
             Worst: O(n*apply), same as best
         """
         if x < 0:
@@ -488,10 +518,13 @@ class SequenceLayerStore(LayerStore):
             raise ValueError("y must be greater than 0")
 
         colour = start
-        count = 0
-        while count < self.sorted_list.length:
-            list_item = self.sorted_list[count]
-            layer = list_item.value
-            colour = layer.apply(colour, timestamp, x, y)
-            count += 1
+        elems = self.applied.elems
+        # layers applied before the last opaque one cannot affect the result, so
+        # drop their bits before walking the dispatch table
+        opaque_applied = elems & OPAQUE_MASK
+        if opaque_applied:
+            elems &= ~((1 << (opaque_applied.bit_length() - 1)) - 1)
+        for index, apply in REGISTERED_APPLIES:
+            if (elems >> index) & 1:
+                colour = apply(colour, timestamp, x, y)
         return colour
@@ -18,10 +18,12 @@ class Layer:
     apply: function
     name: str = field(init=False)
     bg: tuple[int, int, int] | None = None
+    opaque: bool = field(init=False, default=False)
 
     def __post_init__(self):
         if hasattr(self.apply, "__bg__"):
             self.bg = self.apply.__bg__
+        self.opaque = getattr(self.apply, "__opaque__", False)
         self.name = self.apply.__name__
 
 class background(object):
@@ -43,6 +45,25 @@ class background(object):
         func.__bg__ = self.val
         return layer
 
+def opaque(layer: function|Layer):
+    """Simple decorator to mark a layer whose output ignores the input colour
+
+    Layers applied before an opaque one contribute nothing to the final colour,
+    which lets colour computations skip them.
+
+    Usage:  @register
+            @opaque
+            @background(200, 0, 120)
+            def my_special_layer(...):
+    """
+    # This could be applied before or after registration
+    if isinstance(layer, Layer):
+        func = layer.apply
+    else:
+        func = layer
+    func.__opaque__ = True
+    return layer
+
 def register(func):
     """
     Layer register function.
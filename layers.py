@@ -3,9 +3,10 @@ All layers are defined here.
 """
 
 import colorsys
-from layer_util import background, register
+from layer_util import background, opaque, register
 
 @register
+@opaque
 @background(200, 0, 120)
 def rainbow(color, timestamp, x, y):
     return tuple(
@@ -14,6 +15,7 @@ def rainbow(color, timestamp, x, y):
     )
 
 @register
+@opaque
 @background(170, 170, 170)
 def black(color, timestamp, x, y):
     return (0, 0, 0)
@@ -35,16 +37,19 @@ def invert(color, timestamp, x, y):
     )
 
 @register
+@opaque
 @background(255, 0, 0)
 def red(color, timestamp, x, y):
     return (255, 0, 0)
 
 @register
+@opaque
 @background(0, 255, 0)
 def green(color, timestamp, x, y):
     return (0, 255, 0)
 
 @register
+@opaque
 @background(0, 0, 255)
 def blue(color, timestamp, x, y):
     return (0, 0, 255)
@@ -127,15 +127,18 @@ class MyWindow(arcade.Window):
                              bold=True, anchor_y="center")
         # UI - Draw Modes / Action buttons
         self.action_buttons.draw()
-        # Grid
+        # Grid - one fused sweep for the colours, instead of a grid lookup and a
+        # background-list copy per square
+        colours = self.grid.render(tuple(self.BG), self.timestamp)
         for x in range(self.GRID_SIZE_X):
+            column = colours[x]
             for y in range(self.GRID_SIZE_Y):
                 arcade.draw_lrtb_rectangle_filled(
                     self.GRID_SQ_WIDTH * x,
                     self.GRID_SQ_WIDTH * (x + 1),
                     self.GRID_SQ_HEIGHT * (y + 1),
                     self.GRID_SQ_HEIGHT * y,
-                    self.grid[x][y].get_color(self.BG[:], self.timestamp, x, y),
+                    column[y],
                 )
 
     def on_mouse_press(self, x: int, y: int, button: int, modifiers: int) -> None:
@@ -366,7 +369,9 @@ class MyWindow(arcade.Window):
             Worst: O(undo_apply), same as best
         """
         action = self.undo_tracker.undo(self.grid)
-        self.replay_tracker.add_action(action, True)
+        # only record the undo if there was actually something to undo
+        if action is not None:
+            self.replay_tracker.add_action(action, True)
 
     def on_redo(self) -> None:
         """
@@ -385,7 +390,9 @@ class MyWindow(arcade.Window):
             Worst: O(redo_apply), same as best
         """
         action = self.undo_tracker.redo(self.grid)
-        self.replay_tracker.add_action(action, False)
+        # only record the redo if there was actually something to redo
+        if action is not None:
+            self.replay_tracker.add_action(action, False)
 
     def on_special(self) -> None:
         """
@@ -5,10 +5,15 @@ from data_structures.queue_adt import CircularQueue
 
 
 class ReplayTracker:
+
+    MAX_ACTIONS = 10000
+    MIN_CAPACITY = 16
+    __slots__ = ("replay_queue",)
+
     def __init__(self) -> None:
         """
-        Initialises replay and bool circular queues of size max_actions to track the replays to be done and whether
-        they are undos or not
+        Initialises a small circular queue of replay steps that doubles on
+        demand, capped at MAX_ACTIONS
         Args:
             - No arguments
 
@@ -19,12 +24,24 @@ class ReplayTracker:
             - None
 
         Complexity:
-            Best: O(max_capacity), where max_capacity is max_actions, based on ArrayR
-            Worst: O(max_capacity), same as best
+            Best: O(1), only MIN_CAPACITY slots are allocated up front
+            Worst: O(1), same as best
         """
-        max_actions = 10000
-        self.replay_queue = CircularQueue(max_actions)
-        self.bool_tracker = CircularQueue(max_actions)
+        self.replay_queue = CircularQueue(self.MIN_CAPACITY)
+
+    def _grow(self) -> None:
+        """
+        Doubles the capacity of the queue (without exceeding MAX_ACTIONS) by draining it
+        into a larger CircularQueue.
+
+        Complexity:
+            Best: O(n), where n is the length of the queue
+            Worst: O(n), same as best
+        """
+        new_queue = CircularQueue(min(2 * len(self.replay_queue.array), self.MAX_ACTIONS))
+        for _ in range(self.replay_queue.length):
+            new_queue.append(self.replay_queue.serve())
+        self.replay_queue = new_queue
 
     def start_replay(self) -> None:
         """
@@ -44,23 +61,47 @@ class ReplayTracker:
             have this is False.
 
         Raises:
-            - Type Error: if action is not of Type PaintAction
+            - Type Error: if action is not of Type PaintAction (check is skipped when running with -O)
 
         Returns:
             - None
 
         Complexity:
             Best: O(1), append and is_full are both constant
-            Worst: O(1), same as best
+            Worst: O(n), where n is the length of the queue, when the queue has to grow
+            (amortised O(1))
         """
-        if not isinstance(action, PaintAction):
+        if __debug__ and not isinstance(action, PaintAction):
             raise TypeError("action input is not of type PaintAction")
 
+        if self.replay_queue.length == self.MAX_ACTIONS:
+            return
         if self.replay_queue.is_full():
-            pass
-        else:
-            self.replay_queue.append(action)
-            self.bool_tracker.append(is_undo)
+            self._grow()
+        # resolving the bound method once here, so playback just calls whatever was stored
+        self.replay_queue.append(action.undo_apply if is_undo else action.redo_apply)
+
+    def add_actions(self, actions, is_undo: bool = False) -> None:
+        """
+        Adds several actions to the replay in one call, e.g. a whole stroke at once.
+        Args:
+            - actions: an iterable of PaintAction objects, in playback order
+            - is_undo: a bool applied to every action in the batch, as in add_action
+
+        Raises:
+            - Type Error: if any action is not of Type PaintAction (check is skipped when running with -O)
+
+        Returns:
+            - None
+
+        Complexity:
+            Best: O(k), where k is the number of actions in the batch
+            Worst: O(k + n), where n is the length of the queue, when the queue has to grow
+        """
+        # binding the method once so the loop skips an attribute lookup per action
+        add_action = self.add_action
+        for action in actions:
+            add_action(action, is_undo)
 
     def play_next_action(self, grid: Grid) -> bool:
         """
@@ -69,7 +110,7 @@ class ReplayTracker:
             - grid: a Grid object
 
         Raises:
-            - Type Error: if grid is not of type Grid
+            - Type Error: if grid is not of type Grid (check is skipped when running with -O)
 
         Returns:
             - bool: If there were no more actions to play, and so nothing happened, return True. Otherwise, return
@@ -79,20 +120,14 @@ class ReplayTracker:
             Best: O(n), where n is the greater complexity of redo_apply and undo_apply
             Worst: O(n), where n is the greater complexity of redo_apply and undo_apply
         """
-        if not isinstance(grid, Grid):
+        if __debug__ and not isinstance(grid, Grid):
             raise TypeError("grid input is not of type Grid")
 
         if self.replay_queue.is_empty():
-            self.replay_queue.clear()
             return True
         else:
-            undo_bool = self.bool_tracker.serve()
-            action = self.replay_queue.serve()
-            if not undo_bool:
-                action.redo_apply(grid)
-            else:
-                action.undo_apply(grid)
-
+            # the stored step is already the right bound method, so just call it
+            self.replay_queue.serve()(grid)
             return False
 
 
@@ -7,9 +7,14 @@ from grid import Grid
 
 class UndoTracker:
 
+    MAX_ACTIONS = 10000
+    MIN_CAPACITY = 16
+    __slots__ = ("action_stack", "redo_stack")
+
     def __init__(self):
         """
-        Initialises an action and redo Array Stack of length max_actions
+        Initialises small action and redo Array Stacks that double on demand,
+        capped at MAX_ACTIONS
         Args:
             - Nothing
 
@@ -20,39 +25,77 @@ class UndoTracker:
             - None
 
         Complexity:
-            Best: O(max_capacity), where max_capacity is the max_actions
-            Worst: O(max_capacity), same as best
+            Best: O(1), only MIN_CAPACITY slots are allocated per stack up front
+            Worst: O(1), same as best
+        """
+        self.action_stack = ArrayStack(self.MIN_CAPACITY)
+        self.redo_stack = ArrayStack(self.MIN_CAPACITY)
+
+    def _grow(self, stack: ArrayStack) -> ArrayStack:
+        """
+        Doubles the capacity of the stack (without exceeding MAX_ACTIONS) by copying it
+        into a larger ArrayStack.
+
+        Complexity:
+            Best: O(n), where n is the length of the stack
+            Worst: O(n), same as best
         """
-        max_actions = 10000
-        self.action_stack = ArrayStack(max_actions)
-        self.redo_stack = ArrayStack(max_actions)
+        new_stack = ArrayStack(min(2 * len(stack.array), self.MAX_ACTIONS))
+        for i in range(len(stack)):
+            new_stack.push(stack.array[i])
+        return new_stack
+
+    def _push(self, stack: ArrayStack, action: PaintAction) -> ArrayStack:
+        """
+        Pushes action onto stack, growing it first if it is full. A stack already at
+        MAX_ACTIONS drops the action instead. Returns the stack the caller should keep
+        (a new one whenever growth occurred).
+
+        Complexity:
+            Best: O(1), push is constant
+            Worst: O(n), where n is the length of the stack, when the stack has to grow
+            (amortised O(1))
+        """
+        try:
+            stack.push(action)
+        except Exception:
+            if len(stack.array) < self.MAX_ACTIONS:
+                stack = self._grow(stack)
+                stack.push(action)
+        return stack
 
     def add_action(self, action: PaintAction) -> None:
         """
         Adds an action to the undo tracker.
 
+        A new action invalidates any actions that were undone but not redone,
+        so the redo stack is emptied.
+
         If your collection is already full,
         feel free to exit early and not add the action.
         Args:
             - action: an object of type PaintAction
 
         Raises:
-            - Type Error: if action is not of Type PaintAction
+            - Type Error: if action is not of Type PaintAction (check is skipped when running with -O)
 
         Returns:
             - None
 
         Complexity:
-            Best: O(1), is_full and push are both constant
-            Worst: O(1), same as best
+            Best: O(1), push is constant
+            Worst: O(n), where n is the length of the stack, when the stack has to grow
+            (amortised O(1))
         """
-        if not isinstance(action, PaintAction):
-            raise TypeError("grid input is not of type Grid")
+        if __debug__ and not isinstance(action, PaintAction):
+            raise TypeError("action input is not of type PaintAction")
 
-        if self.action_stack.is_full():
-            pass
-        else:
-            self.action_stack.push(action)
+        # pushing without probing is_full first; a stack at MAX_ACTIONS drops the action
+        self.action_stack = self._push(self.action_stack, action)
+
+        # drawing after an undo forks the history, so undone actions can no longer be
+        # redone; clear() is a single length reset on ArrayStack
+        self.redo_stack.clear()
 
     def undo(self, grid: Grid) -> PaintAction | None:
         """
@@ -62,7 +105,7 @@ class UndoTracker:
             - grid: an object of type Grid
 
         Raises:
-            - Type Error: if grid is not of type Grid
+            - Type Error: if grid is not of type Grid (check is skipped when running with -O)
 
         Returns:
             - The action that was undone, or None
@@ -72,28 +115,23 @@ class UndoTracker:
             constant or greater
             Worst: O(undo_apply), same as best
         """
-        if not isinstance(grid, Grid):
+        if __debug__ and not isinstance(grid, Grid):
             raise TypeError("grid input is not of type Grid")
 
-        # checking if stack of PaintActions is empty, if yes return None
-        if self.action_stack.is_empty():
+        # popping without probing is_empty first; an empty stack means nothing to undo
+        try:
+            action = self.action_stack.pop()
+        except Exception:
             return None
 
-        else:
-            # peek to take the last action
-            action = self.action_stack.peek()
-
-            # undo the action on the grid
-            action.undo_apply(grid)
+        # undo the action on the grid
+        action.undo_apply(grid)
 
-            # add the undone action to a redo stack
-            self.redo_stack.push(action)
+        # add the undone action to a redo stack
+        self.redo_stack = self._push(self.redo_stack, action)
 
-            # remove the undone action from the action stack
-            self.action_stack.pop()
-
-            # return the undone action
-            return action
+        # return the undone action
+        return action
 
     def redo(self, grid: Grid) -> PaintAction | None:
         """
@@ -103,7 +141,7 @@ class UndoTracker:
             - grid: an object of type Grid
 
         Raises:
-            - Type Error: if grid is not of type Grid
+            - Type Error: if grid is not of type Grid (check is skipped when running with -O)
 
         Returns:
             - The action that was redone, or None
@@ -113,24 +151,20 @@ class UndoTracker:
             constant or greater
             Worst: O(redo_apply), same as best
         """
-        if not isinstance(grid, Grid):
+        if __debug__ and not isinstance(grid, Grid):
             raise TypeError("grid input is not of type Grid")
 
-        # check if stack of PaintActions is empty, if yes return None
-        if self.redo_stack.is_empty():
+        # popping without probing is_empty first; an empty stack means nothing to redo
+        try:
+            action = self.redo_stack.pop()
+        except Exception:
             return None
-        else:
-            # peek to get the latest undone action
-            action = self.redo_stack.peek()
-
-            # redo the latest undone action on the grid
-            action.redo_apply(grid)
 
-            # put the redone action back onto the action stack
-            self.action_stack.push(action)
+        # redo the latest undone action on the grid
+        action.redo_apply(grid)
 
-            # remove the redone action from redo stack
-            self.redo_stack.pop()
+        # put the redone action back onto the action stack
+        self.action_stack = self._push(self.action_stack, action)
 
-            # return the redone action
-            return action
+        # return the redone action
+        return action